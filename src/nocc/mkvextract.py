@@ -1,180 +1,135 @@
 """Module for extracting SRT subtitle tracks from MKV files."""
 
+import functools
+import json
+import os
 import re
 import shutil
 import subprocess
 import sys
-import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-from colorama import Fore
-import pysrt
+# Characters dropped from track names when building output filenames
+UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
 
 
+# shutil.which stats every PATH entry, so only look each tool up once per run
+@functools.cache
 def check_mkvextract():
     """Check if mkvextract is available."""
     return shutil.which('mkvextract') is not None
 
 
-def check_mkvinfo():
-    """Check if mkvinfo is available."""
-    return shutil.which('mkvinfo') is not None
+@functools.cache
+def check_mkvmerge():
+    """Check if mkvmerge is available."""
+    return shutil.which('mkvmerge') is not None
 
 
-def list_srt_tracks(mkv_file):
+def _console_handler():
+    """Create the default console output handler."""
+    # Import here to avoid circular import
+    from nocc.nocc import ConsoleOutputHandler
+
+    return ConsoleOutputHandler()
+
+
+def list_srt_tracks(mkv_file, output_handler=None):
     """
     List all SRT subtitle tracks from an MKV file.
     Returns a list of tuples (track_id, track_name, language) for SRT subtitle tracks.
     Language can be None if not specified in the MKV file.
     """
-    if not check_mkvextract():
-        print(Fore.RED + 'mkvextract not found. Please install MKVToolNix.')
+    if not check_mkvmerge():
+        (output_handler or _console_handler()).error('mkvmerge not found. Please install MKVToolNix.')
         return []
 
-    tracks = []
-    
     result = subprocess.run(
-        ['mkvinfo', mkv_file],
-        capture_output=True,
-        text=True,
-        check=True
+        ['mkvmerge', '-J', mkv_file],
+        capture_output=True
     )
-    lines = result.stdout.split('\n')
-    
-    current_track_id = None
-    current_codec = None
-    current_name = None
-    current_language = None
-    in_track = False
-    
-    for line in lines:
-        stripped = line.strip()
-        # Detect start of a track - check for "| + Track" (with space after pipe)
-        # This matches track headers but not "|+ Tracks" section header
-        # Use regex to match "| + Track" exactly (with optional trailing whitespace)
-        if re.match(r'^\|\s+\+\s+Track\s*$', line.strip()):
-            # Save previous track if it was SRT
-            if current_track_id is not None and current_codec and 'S_TEXT/UTF8' in current_codec:
-                track_name = current_name or f'Track {current_track_id}'
-                tracks.append((current_track_id, track_name, current_language))
-            # Reset for new track
-            current_track_id = None
-            current_codec = None
-            current_name = None
-            current_language = None
-            in_track = True
-        elif in_track:
-            # Check if we've left the track section (e.g., see a section header at same or higher level)
-            # This handles cases where tracks section ends before next track
-            if line.startswith('|+') and 'Track' not in line:
-                # We've left the tracks section, save current track if valid
-                if current_track_id is not None and current_codec and 'S_TEXT/UTF8' in current_codec:
-                    track_name = current_name or f'Track {current_track_id}'
-                    tracks.append((current_track_id, track_name, current_language))
-                # Reset and exit track mode
-                current_track_id = None
-                current_codec = None
-                current_name = None
-                current_language = None
-                in_track = False
-                continue
-            # First, try to extract track ID from any line that contains it
-            # This handles both "Track ID: X" and "Track number: X (track ID for mkvmerge & mkvextract: Y)"
-            # Use regex search directly since it's more reliable than string containment
-            match = re.search(r'track ID for mkvmerge & mkvextract:\s*(\d+)', stripped, re.IGNORECASE)
-            if match:
-                try:
-                    current_track_id = int(match.group(1))
-                except ValueError:
-                    pass
-            elif 'Track ID:' in stripped and current_track_id is None:
-                # Handle standalone "Track ID: X" format
-                parts = stripped.split(':')
-                if len(parts) > 1:
-                    # Get the last part and extract any number from it
-                    id_part = parts[-1].strip()
-                    # Remove any trailing parentheses or other characters
-                    id_part = id_part.rstrip(')').strip()
-                    try:
-                        current_track_id = int(id_part)
-                    except ValueError:
-                        pass
-            # Also check for "Track number:" as fallback if Track ID wasn't found
-            elif 'Track number:' in stripped and current_track_id is None:
-                # Extract track number as fallback
-                parts = stripped.split(':')
-                if len(parts) > 1:
-                    # Try to extract track number (first number after colon)
-                    id_part = parts[-1].strip().split()[0]  # Get first number
-                    try:
-                        current_track_id = int(id_part)
-                    except ValueError:
-                        pass
-            # Extract codec
-            elif 'Codec ID:' in stripped:
-                parts = stripped.split(':', 1)
-                if len(parts) > 1:
-                    current_codec = parts[-1].strip()
-            # Extract track name
-            elif 'Name:' in stripped and 'Track name:' not in stripped:
-                parts = stripped.split(':', 1)
-                if len(parts) > 1:
-                    current_name = parts[-1].strip()
-            # Extract language (IETF BCP 47)
-            elif 'Language (IETF BCP 47):' in stripped:
-                parts = stripped.split(':', 1)
-                if len(parts) > 1:
-                    current_language = parts[-1].strip()
-    
-    # Don't forget the last track
-    if current_track_id is not None and current_codec and 'S_TEXT/UTF8' in current_codec:
-        track_name = current_name or f'Track {current_track_id}'
-        tracks.append((current_track_id, track_name, current_language))
+    # mkvmerge exits with 1 when it only has warnings, 2 means identification failed
+    if result.returncode > 1:
+        raise subprocess.CalledProcessError(
+            result.returncode, result.args, output=result.stdout, stderr=result.stderr
+        )
+    info = json.loads(result.stdout)
+
+    tracks = []
+    for track in info.get('tracks', []):
+        properties = track.get('properties', {})
+        if 'S_TEXT/UTF8' not in properties.get('codec_id', ''):
+            continue
+        track_id = track['id']
+        track_name = properties.get('track_name') or f'Track {track_id}'
+        tracks.append((track_id, track_name, properties.get('language_ietf')))
 
     return tracks
 
 
-def extract_srt_track(mkv_file, track_id, output_file):
-    """Extract a specific SRT track from an MKV file."""
+def extract_srt_tracks(mkv_file, outputs, output_handler=None):
+    """
+    Extract SRT tracks from an MKV file in a single mkvextract run.
+
+    Args:
+        mkv_file: Path to the MKV file
+        outputs: List of (track_id, output_file) tuples
+        output_handler: Handler for console output, defaults to ConsoleOutputHandler
+    """
     try:
         subprocess.run(
-            ['mkvextract', 'tracks', mkv_file, f'{track_id}:{output_file}'],
+            ['mkvextract', 'tracks', mkv_file,
+             *(f'{track_id}:{output_file}' for track_id, output_file in outputs)],
             check=True,
             capture_output=True
         )
         return True
     except subprocess.CalledProcessError as e:
-        print(Fore.RED + f'Failed to extract track {track_id}: {e}')
+        track_ids = ', '.join(str(track_id) for track_id, _ in outputs)
+        (output_handler or _console_handler()).error(f'Failed to extract tracks {track_ids}: {e}')
         return False
 
 
-def process_mkv(mkv_file, language_filter=None):
+def process_mkv(mkv_file, language_filter=None, output_handler=None):
     """
     Process an MKV file by extracting and processing SRT subtitle tracks.
     
     Args:
         mkv_file: Path to the MKV file
         language_filter: Optional language code (IETF BCP 47) to filter tracks by (e.g., 'en')
+        output_handler: Handler for all output, defaults to ConsoleOutputHandler. Only a
+            ConsoleOutputHandler has tracks cleaned in worker processes.
     """
+    # Import here to avoid circular import
+    from nocc.nocc import (
+        ConsoleOutputHandler,
+        _process_subtitle_file_buffered,
+        _use_process_pool,
+        process_subtitle_file,
+    )
+
+    handler = output_handler or _console_handler()
+
     if not check_mkvextract():
-        print(Fore.RED + 'mkvextract not found. Please install MKVToolNix.')
+        handler.error('mkvextract not found. Please install MKVToolNix.')
         return
 
-    if not check_mkvinfo():
-        print(Fore.RED + 'mkvinfo not found. Please install MKVToolNix.')
+    if not check_mkvmerge():
+        handler.error('mkvmerge not found. Please install MKVToolNix.')
         sys.exit(1)
 
     mkv_path = Path(mkv_file)
     if not mkv_path.exists():
-        print(Fore.RED + f'File not found: {mkv_file}')
+        handler.error(f'File not found: {mkv_file}')
         return
 
-    print(Fore.CYAN + f'Processing MKV file: {mkv_file}')
+    handler.info(f'Processing MKV file: {mkv_file}')
 
     # List all SRT tracks
-    all_tracks = list_srt_tracks(mkv_file)
+    all_tracks = list_srt_tracks(mkv_file, handler)
     if not all_tracks:
-        print(Fore.YELLOW + 'No SRT subtitle tracks found in MKV file.')
+        handler.warning('No SRT subtitle tracks found in MKV file.')
         return
 
     # Filter tracks by language if specified
@@ -185,51 +140,80 @@ def process_mkv(mkv_file, language_filter=None):
             if lang and lang.lower() == language_filter.lower()
         ]
         if not tracks:
-            print(Fore.YELLOW + f'No SRT subtitle tracks found with language code: {language_filter}')
-            print(Fore.CYAN + f'Available tracks:')
+            handler.warning(f'No SRT subtitle tracks found with language code: {language_filter}')
+            available = ['Available tracks:']
             for track_id, track_name, lang in all_tracks:
                 lang_display = lang if lang else '(no language specified)'
-                print(Fore.CYAN + f'  Track {track_id}: {track_name} - {lang_display}')
+                available.append(f'  Track {track_id}: {track_name} - {lang_display}')
+            handler.info('\n'.join(available))
             return
-        print(Fore.CYAN + f'Filtering by language: {language_filter}')
+        handler.info(f'Filtering by language: {language_filter}')
     else:
         tracks = all_tracks
 
-    print(Fore.CYAN + f'Found {len(tracks)} SRT subtitle track(s)')
-
-    # Import here to avoid circular import
-    from nocc.nocc import process_subtitle_file
-
-    # Create a temporary directory for extracted tracks
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp_path = Path(tmpdir)
-        base_name = mkv_path.stem
-
-        for track_id, track_name, lang in tracks:
+    handler.info(f'Found {len(tracks)} SRT subtitle track(s)')
+
+    base_name = mkv_path.stem
+    output_paths = {}
+    for track_id, track_name, _ in tracks:
+        # Sanitize track name for filename
+        safe_track_name = UNSAFE_FILENAME_RE.sub('', track_name).strip().replace(' ', '_')
+        if not safe_track_name:
+            safe_track_name = f'track{track_id}'
+
+        # Construct final output path (filenames are always the cleaned subtitles)
+        output_name = f'{base_name}_track{track_id}_{safe_track_name}.srt'
+        output_paths[track_id] = mkv_path.parent / output_name
+
+    # Extract all tracks at once, mkvextract demuxes the whole file per run. Tracks
+    # are written next to their final paths and only moved there once all of them
+    # were extracted, so a failed run leaves earlier outputs alone.
+    temp_paths = {
+        track_id: output_path.with_name(f'.{output_path.name}.tmp')
+        for track_id, output_path in output_paths.items()
+    }
+    outputs = [(track_id, str(temp_path)) for track_id, temp_path in temp_paths.items()]
+    if not extract_srt_tracks(mkv_file, outputs, handler):
+        for temp_path in temp_paths.values():
+            temp_path.unlink(missing_ok=True)
+        return
+    for track_id, temp_path in temp_paths.items():
+        os.replace(temp_path, output_paths[track_id])
+
+    # Clean the extracted tracks concurrently, output is replayed in track order.
+    # Workers capture console text, so other handlers get the tracks cleaned here.
+    executor = None
+    futures = []
+    if _use_process_pool(len(tracks)) and isinstance(handler, ConsoleOutputHandler):
+        executor = ProcessPoolExecutor()
+        futures = [
+            executor.submit(_process_subtitle_file_buffered, str(path), str(path), handler.color)
+            for path in output_paths.values()
+        ]
+    try:
+        for index, (track_id, track_name, lang) in enumerate(tracks):
             lang_display = f' ({lang})' if lang else ''
-            print(Fore.CYAN + f'Processing track {track_id}: {track_name}{lang_display}')
-
-            # Extract track to temporary file
-            temp_srt = tmp_path / f'track_{track_id}.srt'
-            if not extract_srt_track(mkv_file, track_id, str(temp_srt)):
-                continue
-
-            # Sanitize track name for filename
-            safe_track_name = re.sub(r'[^\w\s-]', '', track_name).strip().replace(' ', '_')
-            if not safe_track_name:
-                safe_track_name = f'track{track_id}'
-            
-            # Construct final output path (filenames are always the cleaned subtitles)
-            output_name = f'{base_name}_track{track_id}_{safe_track_name}.srt'
-            output_path = mkv_path.parent / output_name
-
-            # Process the extracted SRT file with explicit output path
-            was_modified = process_subtitle_file(str(temp_srt), output_path=str(output_path))
-            
-            if was_modified:
-                print(Fore.GREEN + f'Saved processed track to: {output_path}')
-            elif temp_srt.exists():
-                # File was already clean, but we still want to save it under the same
-                # cleaned filename convention.
-                shutil.copy(str(temp_srt), str(output_path))
-                print(Fore.GREEN + f'Saved clean track to: {output_path}')
+            handler.info(f'Processing track {track_id}: {track_name}{lang_display}')
+
+            output_path = output_paths[track_id]
+            error = None
+            if executor is not None:
+                was_modified, output, error = futures[index].result()
+                sys.stdout.write(output)
+            else:
+                try:
+                    was_modified = process_subtitle_file(str(output_path), handler, output_path=str(output_path))
+                except Exception as e:
+                    error = str(e)
+
+            if error is not None:
+                # Don't leave the uncleaned track behind under the cleaned filename
+                output_path.unlink(missing_ok=True)
+                handler.error(f'Failed to process track {track_id}: {error}')
+            elif was_modified:
+                handler.success(f'Saved processed track to: {output_path}')
+            else:
+                handler.success(f'Saved clean track to: {output_path}')
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
@@ -1,8 +1,14 @@
 import argparse
+import codecs
+import contextlib
+import io
+import itertools
+import os
 import re
 import sys
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Protocol, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, TextIO, Tuple
 
 import colorama
 from colorama import Fore
@@ -18,12 +24,19 @@ class Config:
     # Thresholds for join_short function
     MAX_LINE_LENGTH: int = 30
     MAX_JOINED_LENGTH: int = 40
+    # Music notes marking song lyrics, the whole subtitle is dropped
+    SONG_CHARACTERS: str = '\u266a\u266b\u266c'
+    # Deprecated single song character, use SONG_CHARACTERS. Still honoured.
     SONG_CHARACTER: str = '\u266a'
+    # Number of distinct subtitle texts SubtitleCleaner remembers results for, 0 disables caching
+    CACHE_SIZE: int = 4096
+    # Fewest subtitle files or MKV tracks worth starting worker processes for
+    MIN_PARALLEL_FILES: int = 4
 
 
 # Type definitions
 RemoveRule = Tuple[str, re.Pattern[str]]
-ReplaceRule = Tuple[str, str, str]
+ReplaceRule = Tuple[str, re.Pattern[str], str]
 CleaningResult = Tuple[str, List[str]]  # (cleaned_text, list_of_applied_rules)
 
 
@@ -56,36 +69,71 @@ class OutputHandler(Protocol):
 
 
 class ConsoleOutputHandler:
-    """Default console output handler using colorama."""
+    """
+    Default console output handler using colorama.
+
+    Messages are collected and written to stdout in a single call. Status messages
+    flush the buffer right away, cleaning details are flushed in batches of
+    FLUSH_THRESHOLD entries. Colors are only added when writing to a terminal.
+    """
+
+    FLUSH_THRESHOLD: int = 200
+
+    def __init__(self, color: Optional[bool] = None) -> None:
+        """
+        Initialize the console output handler.
+
+        Args:
+            color: Whether to add colors, defaults to whether stdout is a terminal
+        """
+        self.color = sys.stdout.isatty() if color is None else color
+        self._buffer: List[str] = []
+
+    def _add(self, color: str, message: str) -> None:
+        self._buffer.append(color + message + '\n' if self.color else message + '\n')
+
+    def flush(self) -> None:
+        """Write all buffered messages to stdout."""
+        if self._buffer:
+            sys.stdout.write(''.join(self._buffer))
+            self._buffer.clear()
 
     def info(self, message: str) -> None:
-        print(Fore.CYAN + message)
+        self._add(Fore.CYAN, message)
+        self.flush()
 
     def warning(self, message: str) -> None:
-        print(Fore.YELLOW + message)
+        self._add(Fore.YELLOW, message)
+        self.flush()
 
     def error(self, message: str) -> None:
-        print(Fore.RED + message)
+        self._add(Fore.RED, message)
+        self.flush()
 
     def success(self, message: str) -> None:
-        print(Fore.GREEN + message)
+        self._add(Fore.GREEN, message)
+        self.flush()
 
     def show_cleaning(self, original: str, cleaned: str, rules: List[str]) -> None:
         if rules:
-            print(Fore.CYAN + 'Cleaned with: {}{}'.format(Fore.RESET, ', '.join(rules)))
-        print(Fore.YELLOW + original)
-        print(Fore.GREEN + cleaned)
-        print()
+            self._add(Fore.CYAN, 'Cleaned with: {}{}'.format(Fore.RESET if self.color else '', ', '.join(rules)))
+        self._add(Fore.YELLOW, original)
+        self._add(Fore.GREEN, cleaned)
+        self._buffer.append('\n')
+        if len(self._buffer) >= self.FLUSH_THRESHOLD:
+            self.flush()
 
     def show_deleted(self, text: str) -> None:
-        print(Fore.RED + text)
-        print()
+        self._add(Fore.RED, text)
+        self._buffer.append('\n')
+        if len(self._buffer) >= self.FLUSH_THRESHOLD:
+            self.flush()
 
 
 # Cleaning rules
 REMOVE_RE: List[RemoveRule] = [
     # HTML font, we want to leave <i> etc alone
-    ('font styling', re.compile(r'</?font.*?>')),
+    ('font styling', re.compile(r'</?font[^>\n]*>')),
     # SOMEONE:
     # - says
     # SOME ONE:
@@ -94,38 +142,42 @@ REMOVE_RE: List[RemoveRule] = [
     # - says
     # SOME. ONE:
     # - says
-    ('multiline person', re.compile(r'^[0-9A-Z\s\-\#\.]+:\n-\s')),
+    ('multiline person', re.compile(r'^[0-9A-Z\s\-\#\.]+:\n-\s', re.MULTILINE)),
     # SOMEONE: says
     # SOMEONE : says
     # SOME ONE: says
     # SOME-ONE: says
     # SOME. ONE: says
-    ('person', re.compile(r'^[0-9A-Z\s\-\#\.]*?\s?:\s')),
+    ('person', re.compile(r'^[0-9A-Z\s\-\#\.]*?\s?:\s', re.MULTILINE)),
     # middle. SOMEONE: aasf
     ('person middle', re.compile(r'[0-9A-Z]{3,10}\s?:\s')),
     # (LOUDLY)
-    ('effect', re.compile(r'\(.*?\)')),
+    # The rules are order dependent: font tags must be gone before the anchored
+    # person rules can match, and parentheses go before brackets when they overlap.
+    ('effect', re.compile(r'\([^)\n]*\)')),
     # [LOUDLY]
-    ('effect', re.compile(r'\[.*?\]')),
+    ('effect', re.compile(r'\[[^\]\n]*\]')),
     # -
-    ('empty dash', re.compile(r'^\s?-\s?$')),
+    ('empty dash', re.compile(r'^\s?-\s?$', re.MULTILINE)),
     # double spaces
     ('double spaces', re.compile(r'\s\s')),
 ]
 
 REPLACE_RE: List[ReplaceRule] = [
     # -foobar
-    ('dash missing space', r'^-(\w)', r'- \1'),
-    # aaa.foobar
-    ('dot missing space', r'\.(\w)', r'. \1'),
-    # aaa.foobar
-    ('comma missing space', r',(\w)', r', \1'),
-    # aaa?foobar
-    ('? missing space', r'\?(\w)', r'? \1'),
-    # aaa!foobar
-    ('! missing space', r'\!(\w)', r'! \1'),
+    ('dash missing space', re.compile(r'^-(\w)'), r'- \1'),
+    # aaa.foobar, aaa,foobar, aaa?foobar or aaa!foobar
+    ('punctuation missing space', re.compile(r'([.,?!])(\w)'), r'\1 \2'),
 ]
 
+# Cheap probes for text the default rules cannot change. Every removal rule needs
+# one of these characters or a whitespace pair, every replacement rule needs one
+# of the punctuation marks.
+REMOVE_TRIGGER_RE = re.compile(r'[<:(\[\-]|\s\s')
+REPLACE_TRIGGER_RE = re.compile(r'[.,?!\-]')
+# Speaker tag rules all need a ':', a substring test is enough to rule them out
+SPEAKER_RULES = frozenset(('multiline person', 'person', 'person middle'))
+
 class SubtitleCleaner:
     """Handles cleaning of subtitle text by applying removal and replacement rules."""
 
@@ -140,67 +192,125 @@ class SubtitleCleaner:
 
         Args:
             remove_rules: List of (name, regex_pattern) tuples for removal rules
-            replace_rules: List of (name, source_pattern, replacement) tuples for replacement rules
+            replace_rules: List of (name, regex_pattern, replacement) tuples for replacement rules
             config: Configuration object with thresholds and constants
+
+        Custom rules given with plain string patterns are compiled once here.
         """
-        self.remove_rules = remove_rules if remove_rules is not None else REMOVE_RE
-        self.replace_rules = replace_rules if replace_rules is not None else REPLACE_RE
+        self.remove_rules = REMOVE_RE
+        if remove_rules is not None:
+            self.remove_rules = [(name, re.compile(pattern)) for name, pattern in remove_rules]
+        self.replace_rules = REPLACE_RE
+        if replace_rules is not None:
+            self.replace_rules = [
+                (name, re.compile(pattern), replacement) for name, pattern, replacement in replace_rules
+            ]
         self.config = config if config is not None else Config()
+        self.song_characters = self.config.SONG_CHARACTERS
+        if self.config.SONG_CHARACTER not in self.song_characters:
+            self.song_characters += self.config.SONG_CHARACTER
+        # The trigger probes only describe the default rules
+        self.remove_trigger = REMOVE_TRIGGER_RE if remove_rules is None else None
+        self.replace_trigger = REPLACE_TRIGGER_RE if replace_rules is None else None
+        self.speaker_rules = SPEAKER_RULES if remove_rules is None else frozenset()
+        self._cache: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def clean_text(self, text: str) -> CleaningResult:
         """
         Clean a single subtitle text by applying all cleaning rules.
 
+        Results are remembered per text, so repeated lines such as "[MUSIC]" are
+        only run through the rules once.
+
+        Args:
+            text: The original subtitle text to clean
+
+        Returns:
+            Tuple of (cleaned_text, list_of_applied_rule_names)
+        """
+        cached = self._cache.get(text)
+        if cached is not None:
+            self.cache_hits += 1
+            cleaned_text, applied_rules = cached
+            return cleaned_text, list(applied_rules)
+
+        self.cache_misses += 1
+        cleaned_text, rules = self._clean_text(text)
+        if self.config.CACHE_SIZE <= 0:
+            # Caching is turned off
+            return cleaned_text, rules
+        if len(self._cache) >= self.config.CACHE_SIZE:
+            # Dicts keep insertion order, so this evicts the oldest entry
+            del self._cache[next(iter(self._cache))]
+        self._cache[text] = (cleaned_text, tuple(rules))
+        return cleaned_text, rules
+
+    def _clean_text(self, text: str) -> CleaningResult:
+        """
+        Clean a single subtitle text without consulting the cache.
+
         Args:
             text: The original subtitle text to clean
 
         Returns:
             Tuple of (cleaned_text, list_of_applied_rule_names)
         """
+        # Rules only strip the text when they change it, so strip the input once here
+        text = text.strip()
         if not text:
             return '', []
 
-        original_text = text
+        # Check for song characters first (special case)
+        if any(character in text for character in self.song_characters):
+            return '', ['song']
+
         applied_rules: List[str] = []
 
-        # Check for song character first (special case)
-        if self.config.SONG_CHARACTER in text:
-            return '', ['song']
+        # Plain dialog lines cannot match any rule, skip straight past them
+        remove_rules = self.remove_rules
+        if self.remove_trigger is not None and not self.remove_trigger.search(text):
+            remove_rules = []
+
+        # Removing text never adds a ':', so this holds for the whole loop
+        has_colon = ':' in text
 
         # Apply removal rules
-        for rule_name, regex_pattern in self.remove_rules:
-            original_before_rule = text
+        for rule_name, regex_pattern in remove_rules:
+            if not has_colon and rule_name in self.speaker_rules:
+                continue
 
-            # Apply regex to whole text first (handles patterns that span lines)
-            text = regex_pattern.sub('', text)
+            # Anchored rules are compiled with re.MULTILINE, so a single pass
+            # handles every line as well as matches spanning lines
+            text, count = regex_pattern.subn('', text)
 
-            # Apply regex to each line separately for line-by-line patterns
-            lines = text.split('\n')
-            cleaned_lines = []
-            for line in lines:
-                cleaned_line = regex_pattern.sub('', line)
-                cleaned_lines.append(cleaned_line)
-            text = '\n'.join(cleaned_lines)
+            # Strip whitespace left behind by the removal
+            if count:
+                text = text.strip()
 
             # Check if the entire text (when joined) would be empty after this rule
             # This handles multiline patterns that span across lines
             # e.g., "( FOO BAR\nLOREM IPSUM )" would be completely removed
-            joined_text = text.replace('\n', ' ')
-            if not regex_pattern.sub('', joined_text).strip():
+            # Single line text was already covered by the pass above
+            if not text or (
+                '\n' in text and not regex_pattern.sub('', text.replace('\n', ' ')).strip()
+            ):
                 # The entire text is matched by this pattern, remove it
                 return '', [f'multiline with {rule_name}']
 
-            # Strip whitespace between rule applications
-            text = text.strip()
-
-            if original_before_rule != text:
+            if count:
                 applied_rules.append(rule_name)
 
+        replace_rules = self.replace_rules
+        if self.replace_trigger is not None and not self.replace_trigger.search(text):
+            replace_rules = []
+
         # Apply replacement rules
-        for rule_name, source_pattern, replacement in self.replace_rules:
-            original_before_rule = text
-            text = re.sub(source_pattern, replacement, text).strip()
-            if original_before_rule != text:
+        for rule_name, source_pattern, replacement in replace_rules:
+            text, count = source_pattern.subn(replacement, text)
+            if count:
+                text = text.strip()
                 applied_rules.append(rule_name)
 
         # Join short multiline texts
@@ -220,33 +330,164 @@ class SubtitleCleaner:
         Returns:
             Tuple of (was_joined, result_text)
         """
-        lines = text.split('\n')
-        if len(lines) <= 1 or '-' in text:
+        # Joining swaps each newline for a space, so the joined length is known
+        # up front and long texts never need to be split
+        if '\n' not in text or len(text) >= self.config.MAX_JOINED_LENGTH:
+            return False, text
+
+        # Don't join dialogue, hyphenated words like well-known are fine
+        if text.startswith('-') or '\n-' in text:
             return False, text
 
-        # Find max line length
-        max_len = max((len(line) for line in lines), default=0)
+        lines = text.split('\n')
 
         # Don't join if first line ends with '?' (question-answer format)
         if lines[0].endswith('?'):
             return False, text
 
-        # Join if all lines are short and the joined result is also short
-        joined = ' '.join(lines)
-        if 0 < max_len < self.config.MAX_LINE_LENGTH and len(joined) < self.config.MAX_JOINED_LENGTH:
-            return True, joined
+        # Join if all lines are short
+        max_len = max(map(len, lines))
+        if 0 < max_len < self.config.MAX_LINE_LENGTH:
+            return True, ' '.join(lines)
 
         return False, text
 
 
+def _config_settings() -> Tuple[Tuple[str, object], ...]:
+    """Snapshot the Config settings a cleaner may have copied or cached results for."""
+    return tuple((name, getattr(Config, name)) for name in dir(Config) if name.isupper())
+
+
+# Shared cleaner for the default rules, so processing many files doesn't rebuild it
+DEFAULT_CLEANER = SubtitleCleaner()
+_DEFAULT_CLEANER_SETTINGS = _config_settings()
+
+
+def _default_cleaner() -> SubtitleCleaner:
+    """
+    Get the shared default cleaner, rebuilt when a Config setting changed since.
+
+    Returns:
+        The shared SubtitleCleaner
+    """
+    global DEFAULT_CLEANER, _DEFAULT_CLEANER_SETTINGS
+    settings = _config_settings()
+    if settings != _DEFAULT_CLEANER_SETTINGS:
+        DEFAULT_CLEANER = SubtitleCleaner()
+        _DEFAULT_CLEANER_SETTINGS = settings
+    return DEFAULT_CLEANER
+
+
+def _open_subtitle_file(filename: str) -> TextIO:
+    """
+    Open an SRT file for streaming, honouring a byte order mark like pysrt.open does.
+
+    Line endings are left untouched so the original style can be kept on output.
+    """
+    with open(filename, 'rb') as raw_file:
+        head = raw_file.read(4)
+
+    if head.startswith((codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE)):
+        encoding = 'utf-32'
+    elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = 'utf-16'
+    else:
+        encoding = 'utf-8-sig'
+    return open(filename, encoding=encoding, newline='')
+
+
+# Subtitle index and timing lines already in the form pysrt writes them back in,
+# anything else is parsed by pysrt so its normalisation is kept
+SRT_INDEX_RE = re.compile(r'0|[1-9][0-9]*')
+SRT_TIMING_RE = re.compile(r'[0-9]{2}:[0-5][0-9]:[0-5][0-9],[0-9]{3} --> [0-9]{2}:[0-5][0-9]:[0-5][0-9],[0-9]{3}')
+
+
+def _stream_subtitles(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Split SRT lines into subtitles the same way pysrt.stream does.
+
+    Timestamps are only parsed for blocks not already in canonical form, which
+    avoids pysrt's per item time parsing and formatting for typical files.
+    Blocks pysrt can't parse are skipped.
+
+    Args:
+        lines: SRT file lines, with or without line endings
+
+    Returns:
+        Iterator of (header, text) tuples, header being the index and timing lines
+    """
+    block: List[str] = []
+    for line in itertools.chain(lines, '\n'):
+        if line.strip():
+            block.append(line.rstrip())
+            continue
+        if not block:
+            continue
+
+        if len(block) > 2 and SRT_INDEX_RE.fullmatch(block[0]) and SRT_TIMING_RE.fullmatch(block[1]):
+            yield f'{block[0]}\n{block[1]}', '\n'.join(block[2:])
+        else:
+            try:
+                item = pysrt.SubRipItem.from_lines(block)
+            except pysrt.Error:
+                pass
+            else:
+                position = f' {item.position}' if item.position.strip() else ''
+                yield f'{item.index}\n{item.start} --> {item.end}{position}', item.text
+        block = []
+
+
+def _clean_stream(
+    source_file: TextIO,
+    output_file: TextIO,
+    cleaner: SubtitleCleaner,
+    handler: OutputHandler,
+) -> bool:
+    """
+    Clean subtitles one at a time from source_file, writing the kept ones to output_file.
+
+    Args:
+        source_file: Open SRT file to read from
+        output_file: Open file the cleaned SRT is written to
+        cleaner: Cleaner applied to each subtitle text
+        handler: Output handler for messages
+
+    Returns:
+        True if any subtitle was modified or deleted, False otherwise
+    """
+    # Keep the end of line style of the source, pysrt.save does the same
+    first_line = source_file.readline()
+    eol = next((eol for eol in ('\r\n', '\r', '\n') if first_line.endswith(eol)), os.linesep)
+
+    modified = False
+    for header, original_text in _stream_subtitles(itertools.chain([first_line], source_file)):
+        cleaned_text, applied_rules = cleaner.clean_text(original_text)
+
+        if not cleaned_text:
+            handler.show_deleted(original_text)
+            modified = True
+            continue
+        if cleaned_text != original_text:
+            handler.show_cleaning(original_text, cleaned_text, applied_rules)
+            modified = True
+
+        output_file.write(f'{header}\n{cleaned_text}\n'.replace('\n', eol) + eol)
+
+    return modified
+
+
 def process_subtitle_file(
     filename: str,
     output_handler: Optional[OutputHandler] = None,
     output_path: Optional[str] = None,
+    cleaner: Optional[SubtitleCleaner] = None,
 ) -> bool:
     """
     Process a subtitle file, cleaning it and saving the result.
 
+    Subtitles are streamed from the source into a temporary file next to the
+    destination, which replaces the destination once the whole file is processed.
+
     Args:
         filename: Path to the SRT file to process
         output_handler: Optional output handler for messages (defaults to ConsoleOutputHandler)
@@ -255,53 +496,58 @@ def process_subtitle_file(
                      _subtitle.srt) and the cleaned subtitles are written back to the
                      original filename. If provided, uses this exact path without
                      renaming the source file.
+        cleaner: Optional cleaner to use, defaults to a shared cleaner for the default
+                 rules and current Config settings
 
     Returns:
         True if the file was modified, False otherwise
 
     Raises:
         FileNotFoundError: If the file doesn't exist
-        pysrt.Error: If the file cannot be parsed
+        UnicodeDecodeError: If the file cannot be decoded
     """
     handler = output_handler or ConsoleOutputHandler()
-    cleaner = SubtitleCleaner()
+    # Cleaning details are buffered by ConsoleOutputHandler, so always write them out
+    try:
+        return _process_subtitle_file(filename, handler, output_path, cleaner or _default_cleaner())
+    finally:
+        if isinstance(handler, ConsoleOutputHandler):
+            handler.flush()
 
+
+def _process_subtitle_file(
+    filename: str,
+    handler: OutputHandler,
+    output_path: Optional[str],
+    cleaner: SubtitleCleaner,
+) -> bool:
+    """Clean and save a subtitle file, see process_subtitle_file."""
     try:
-        subs = pysrt.open(filename)
+        source_file = _open_subtitle_file(filename)
     except Exception as e:
         handler.error(f'Failed to open subtitle file {filename}: {e}')
         raise
 
-    delete_indices: List[int] = []
-    modified = False
-
-    for index, subtitle in enumerate(subs):
-        original_text = subtitle.text
-        cleaned_text, applied_rules = cleaner.clean_text(original_text)
-
-        if not cleaned_text:
-            handler.show_deleted(original_text)
-            delete_indices.append(index)
-            modified = True
-        elif cleaned_text != original_text:
-            handler.show_cleaning(original_text, cleaned_text, applied_rules)
-            modified = True
-
-        subtitle.text = cleaned_text
-
-    # Remove marked subtitles (in reverse order to maintain indices)
-    for index in reversed(delete_indices):
-        del subs[index]
+    target_path = Path(output_path if output_path is not None else filename)
+    temp_path = target_path.with_name(f'.{target_path.name}.tmp')
+    try:
+        with source_file, open(temp_path, 'w', encoding='utf-8', newline='') as temp_file:
+            modified = _clean_stream(source_file, temp_file, cleaner, handler)
+    except Exception as e:
+        temp_path.unlink(missing_ok=True)
+        handler.error(f'Failed to process subtitle file {filename}: {e}')
+        raise
 
     if output_path is not None:
         if modified:
-            output_filename = output_path
             try:
-                subs.save(output_filename, encoding='utf-8')
+                os.replace(temp_path, output_path)
             except Exception as e:
-                handler.error(f'Failed to save processed file {output_filename}: {e}')
+                temp_path.unlink(missing_ok=True)
+                handler.error(f'Failed to save processed file {output_path}: {e}')
                 raise
         else:
+            temp_path.unlink()
             handler.success(f'Already clean file: {filename}')
     else:
         original_path = Path(filename)
@@ -309,11 +555,12 @@ def process_subtitle_file(
         try:
             original_path.rename(backup_path)
         except Exception as e:
+            temp_path.unlink(missing_ok=True)
             handler.error(f'Failed to backup original file {filename} to {backup_path}: {e}')
             raise
 
         try:
-            subs.save(str(original_path), encoding='utf-8')
+            os.replace(temp_path, original_path)
         except Exception as e:
             handler.error(f'Failed to save processed file {original_path}: {e}')
             raise
@@ -326,13 +573,81 @@ def process_subtitle_file(
     return modified
 
 
+def _process_subtitle_file_buffered(
+    filename: str,
+    output_path: Optional[str] = None,
+    color: bool = False,
+) -> Tuple[bool, str, Optional[str]]:
+    """
+    Process a subtitle file in a worker process, capturing its console output.
+
+    Args:
+        filename: Path to the SRT file to process
+        output_path: Optional path for the output file, see process_subtitle_file
+        color: Whether to add colors to the captured output
+
+    Returns:
+        Tuple of (was_modified, captured_output, error_message), error_message is None
+        on success
+    """
+    buffer = io.StringIO()
+    modified = False
+    error: Optional[str] = None
+    with contextlib.redirect_stdout(buffer):
+        handler = ConsoleOutputHandler(color=color)
+        try:
+            modified = process_subtitle_file(filename, handler, output_path=output_path)
+        except Exception as e:
+            error = str(e)
+    return modified, buffer.getvalue(), error
+
+
+def _use_process_pool(count: int) -> bool:
+    """
+    Check whether count independent subtitle files are worth cleaning in worker processes.
+
+    A few files are cleaned faster than the workers start, as is anything on one CPU.
+    """
+    return count >= Config.MIN_PARALLEL_FILES and (os.cpu_count() or 1) > 1
+
+
+def _report_started_files(
+    files: List[str],
+    pending: Dict[int, Future[Tuple[bool, str, Optional[str]]]],
+    handler: OutputHandler,
+) -> None:
+    """
+    Cancel the files still queued and report those the workers already started.
+
+    When the run is aborted, workers may already have cleaned and rewritten files
+    that were not reported yet, so their output is still replayed in command line
+    order.
+
+    Args:
+        files: Files given on the command line
+        pending: Futures of the files not reported yet, by file index
+        handler: Output handler for messages
+    """
+    started = [index for index in sorted(pending) if not pending[index].cancel()]
+    for index in started:
+        try:
+            _, output, error = pending[index].result()
+        except Exception as e:
+            output, error = '', str(e)
+        sys.stdout.write(output)
+        if error is not None:
+            handler.error(f'Error processing {files[index]}: {error}')
+
+
 def main() -> None:
     """
     Main entry point for the nocc command-line tool.
 
     Processes subtitle files (.srt) or extracts and processes subtitles from MKV files (.mkv).
     """
-    colorama.init(autoreset=True)
+    # Colors are only written to a terminal, so skip installing the stdout wrapper otherwise
+    if sys.stdout.isatty():
+        colorama.init(autoreset=True)
 
     parser = argparse.ArgumentParser(
         description='Remove closed captioning from subtitles',
@@ -353,18 +668,48 @@ def main() -> None:
 
     handler = ConsoleOutputHandler()
 
-    for fn in args.files:
-        fn_path = Path(fn)
-        if fn_path.suffix.lower() == '.mkv':
-            process_mkv(fn, language_filter=args.lang)
-        else:
+    # Subtitle files are independent, so clean them in worker processes up front
+    # and replay each worker's captured output in command line order below
+    srt_indices = [
+        index for index, fn in enumerate(args.files) if Path(fn).suffix.lower() != '.mkv'
+    ]
+    executor: Optional[ProcessPoolExecutor] = None
+    pending: Dict[int, Future[Tuple[bool, str, Optional[str]]]] = {}
+    if _use_process_pool(len(srt_indices)):
+        executor = ProcessPoolExecutor()
+        for index in srt_indices:
+            pending[index] = executor.submit(
+                _process_subtitle_file_buffered, args.files[index], None, handler.color
+            )
+
+    try:
+        for index, fn in enumerate(args.files):
+            fn_path = Path(fn)
+            if fn_path.suffix.lower() == '.mkv':
+                process_mkv(fn, language_filter=args.lang, output_handler=handler)
+                continue
+
             if args.lang:
                 handler.warning(f'Warning: --lang argument is only used for MKV files. Ignoring for {fn}')
-            try:
-                process_subtitle_file(fn, handler)
-            except Exception as e:
-                handler.error(f'Error processing {fn}: {e}')
+
+            error: Optional[str] = None
+            if index in pending:
+                _, output, error = pending.pop(index).result()
+                sys.stdout.write(output)
+            else:
+                try:
+                    process_subtitle_file(fn, handler)
+                except Exception as e:
+                    error = str(e)
+
+            if error is not None:
+                handler.error(f'Error processing {fn}: {error}')
                 sys.exit(1)
+    finally:
+        if executor is not None:
+            # Any abort, including a failed MKV file, still reports files already cleaned
+            _report_started_files(args.files, pending, handler)
+            executor.shutdown(cancel_futures=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,153 @@
+import contextlib
+import json
+import shutil
+import subprocess
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+import pysrt
+
+from nocc.mkvextract import list_srt_tracks, process_mkv
+
+MKVMERGE_IDENTIFY = {
+    "tracks": [
+        {"id": 0, "type": "video", "properties": {"codec_id": "V_MPEG4/ISO/AVC"}},
+        {
+            "id": 2,
+            "type": "subtitles",
+            "properties": {"codec_id": "S_TEXT/UTF8", "track_name": "English SDH", "language_ietf": "en"},
+        },
+        {"id": 3, "type": "subtitles", "properties": {"codec_id": "S_TEXT/UTF8"}},
+        {"id": 4, "type": "subtitles", "properties": {"codec_id": "S_HDMV/PGS", "language_ietf": "fi"}},
+    ]
+}
+
+
+def test_list_srt_tracks():
+    """Test that only SRT tracks are listed from mkvmerge identification output."""
+    result = subprocess.CompletedProcess(
+        args=["mkvmerge", "-J", "movie.mkv"],
+        returncode=0,
+        stdout=json.dumps(MKVMERGE_IDENTIFY).encode("utf-8"),
+        stderr=b"",
+    )
+
+    with (
+        mock.patch("nocc.mkvextract.check_mkvmerge", return_value=True),
+        mock.patch("nocc.mkvextract.subprocess.run", return_value=result),
+    ):
+        tracks = list_srt_tracks("movie.mkv")
+
+    assert tracks == [(2, "English SDH", "en"), (3, "Track 3", None)]
+
+
+def fake_mkvextract(fixtures):
+    """Build a subprocess.run stand-in that copies fixtures to the requested track outputs."""
+
+    def run(cmd, **kwargs):
+        for spec in cmd[3:]:
+            track_id, output_file = spec.split(":", 1)
+            shutil.copy(Path(__file__).parent / fixtures[int(track_id)], output_file)
+        return subprocess.CompletedProcess(args=cmd, returncode=0, stdout=b"", stderr=b"")
+
+    return run
+
+
+@contextlib.contextmanager
+def mocked_mkv_tools(tracks, run):
+    """Patch the MKVToolNix calls made by process_mkv and capture stdout."""
+    stdout = StringIO()
+    with (
+        mock.patch("nocc.mkvextract.check_mkvextract", return_value=True),
+        mock.patch("nocc.mkvextract.check_mkvmerge", return_value=True),
+        mock.patch("nocc.mkvextract.list_srt_tracks", return_value=tracks),
+        mock.patch("nocc.mkvextract.subprocess.run", side_effect=run),
+        mock.patch("sys.stdout", new=stdout),
+    ):
+        yield stdout
+
+
+def test_process_mkv():
+    """Test that every selected track is extracted, cleaned and saved next to the MKV."""
+    tracks = [(2, "English SDH", "en"), (3, "Track 3", None)]
+    fixtures = {2: "dotted-name.srt", 3: "twodashes.srt"}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mkv_file = Path(tmpdir) / "movie.mkv"
+        mkv_file.touch()
+
+        with mocked_mkv_tools(tracks, fake_mkvextract(fixtures)):
+            process_mkv(str(mkv_file))
+
+        cleaned = pysrt.open(str(Path(tmpdir) / "movie_track2_English_SDH.srt"))
+        assert cleaned.text == "Every last piece,"
+        unchanged = pysrt.open(str(Path(tmpdir) / "movie_track3_Track_3.srt"))
+        assert unchanged.text == "- Line1\n- Line2"
+        assert sorted(p.name for p in Path(tmpdir).iterdir()) == [
+            "movie.mkv",
+            "movie_track2_English_SDH.srt",
+            "movie_track3_Track_3.srt",
+        ]
+
+
+def test_process_mkv_many_tracks():
+    """Test that many tracks are cleaned in worker processes with output in track order."""
+    fixtures = {2: "dotted-name.srt", 3: "twodashes.srt", 4: "short-multiline.srt", 5: "song.srt"}
+    tracks = [(track_id, f"Track {track_id}", None) for track_id in fixtures]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mkv_file = Path(tmpdir) / "movie.mkv"
+        mkv_file.touch()
+
+        with (
+            mocked_mkv_tools(tracks, fake_mkvextract(fixtures)) as stdout,
+            mock.patch("os.cpu_count", return_value=2),
+        ):
+            process_mkv(str(mkv_file))
+
+        assert pysrt.open(str(Path(tmpdir) / "movie_track4_Track_4.srt")).text == "short multiline"
+        positions = [stdout.getvalue().index(f"Processing track {track_id}:") for track_id in fixtures]
+        assert positions == sorted(positions)
+
+
+def test_process_mkv_output_handler():
+    """Test that all output of a custom handler goes through the handler."""
+    tracks = [(2, "English SDH", "en"), (3, "Track 3", None)]
+    fixtures = {2: "dotted-name.srt", 3: "twodashes.srt"}
+    handler = mock.Mock()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mkv_file = Path(tmpdir) / "movie.mkv"
+        mkv_file.touch()
+
+        with mocked_mkv_tools(tracks, fake_mkvextract(fixtures)) as stdout:
+            process_mkv(str(mkv_file), output_handler=handler)
+
+    assert stdout.getvalue() == ""
+    handler.show_cleaning.assert_called_once_with(
+        '<font color="#f93200">MR. COTTON</font> : Every last piece,', "Every last piece,", ["font styling", "person"]
+    )
+
+
+def test_process_mkv_extract_failure():
+    """Test that partly extracted tracks are removed and earlier outputs kept when mkvextract fails."""
+    tracks = [(2, "English SDH", "en"), (3, "Track 3", None)]
+
+    def run(cmd, **kwargs):
+        track_id, output_file = cmd[3].split(":", 1)
+        shutil.copy(Path(__file__).parent / "dotted-name.srt", output_file)
+        raise subprocess.CalledProcessError(2, cmd)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mkv_file = Path(tmpdir) / "movie.mkv"
+        mkv_file.touch()
+        earlier_output = Path(tmpdir) / "movie_track3_Track_3.srt"
+        earlier_output.write_text("earlier run")
+
+        with mocked_mkv_tools(tracks, run):
+            process_mkv(str(mkv_file))
+
+        assert sorted(p.name for p in Path(tmpdir).iterdir()) == ["movie.mkv", "movie_track3_Track_3.srt"]
+        assert earlier_output.read_text() == "earlier run"
@@ -3,10 +3,12 @@ import sys
 import tempfile
 from io import StringIO
 from pathlib import Path
+from unittest import mock
 
 import pysrt
+import pytest
 
-from nocc.nocc import process_subtitle_file
+from nocc.nocc import Config, SubtitleCleaner, _stream_subtitles, main, process_subtitle_file
 
 
 class SilentOutputHandler:
@@ -94,6 +96,11 @@ def test_dotted_name():
     run_nocc_test("dotted-name.srt")
 
 
+def test_effect_overlap():
+    """Test effect-overlap.srt file."""
+    run_nocc_test("effect-overlap.srt")
+
+
 def test_font_multiline_persons():
     """Test font-multiline-persons.srt file."""
     run_nocc_test("font-multiline-persons.srt")
@@ -119,11 +126,21 @@ def test_short_multiline():
     run_nocc_test("short-multiline.srt")
 
 
+def test_short_multiline_hyphen():
+    """Test short-multiline-hyphen.srt file."""
+    run_nocc_test("short-multiline-hyphen.srt")
+
+
 def test_song():
     """Test song.srt file."""
     run_nocc_test("song.srt")
 
 
+def test_song_notes():
+    """Test song-notes.srt file."""
+    run_nocc_test("song-notes.srt")
+
+
 def test_twodashes():
     """Test twodashes.srt file (should remain unchanged)."""
     test_file = get_test_file_path("twodashes.srt")
@@ -139,3 +156,184 @@ def test_twodashes():
         # twodashes.srt should not change content, but backup is still created
         backup_file = test_copy.parent / "_twodashes.srt"
         assert backup_file.exists(), "Backup file should be created for twodashes.srt"
+
+
+def test_output_path_shows_cleaning():
+    """Test that cleaning details are written when saving to a separate output path."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        output_file = Path(tmpdir) / "dotted-name.srt"
+
+        stdout = StringIO()
+        with mock.patch("sys.stdout", new=stdout):
+            process_subtitle_file(str(get_test_file_path("dotted-name.srt")), output_path=str(output_file))
+
+        assert "Cleaned with: font styling, person" in stdout.getvalue()
+        assert read_srt_file(output_file) == read_srt_file(get_expected_output_path("dotted-name.srt"))
+
+
+def test_song_character_config():
+    """Test that the deprecated SONG_CHARACTER setting is still honoured."""
+
+    class StarConfig(Config):
+        SONG_CHARACTER = "*"
+
+    cleaner = SubtitleCleaner(config=StarConfig())
+
+    assert cleaner.clean_text("* Lyrics *") == ("", ["song"])
+    assert cleaner.clean_text("\u266b Lyrics") == ("", ["song"])
+
+
+def test_process_subtitle_file_config_change():
+    """Test that changed Config settings and a given cleaner are used for subtitle files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        test_copy = Path(tmpdir) / "short-multiline.srt"
+        output_file = Path(tmpdir) / "output.srt"
+        shutil.copy(get_test_file_path("short-multiline.srt"), test_copy)
+
+        with mock.patch.object(Config, "SONG_CHARACTERS", "m"):
+            process_subtitle_file(str(test_copy), SilentOutputHandler(), output_path=str(output_file))
+        assert read_srt_file(output_file) == ""
+
+        process_subtitle_file(
+            str(test_copy), SilentOutputHandler(), output_path=str(output_file), cleaner=SubtitleCleaner()
+        )
+        assert read_srt_file(output_file) == read_srt_file(get_expected_output_path("short-multiline.srt"))
+
+
+def test_clean_text_cache():
+    """Test that repeated subtitle texts are served from the cleaner's cache."""
+    cleaner = SubtitleCleaner()
+
+    first = cleaner.clean_text("JOHN: (LAUGHS) Hello")
+    first[1].append("mutated by caller")
+    second = cleaner.clean_text("JOHN: (LAUGHS) Hello")
+
+    assert second == ("Hello", ["person", "effect"])
+    assert cleaner.cache_hits == 1
+    assert cleaner.cache_misses == 1
+
+
+def test_main_multiple_files_first_fails():
+    """Test that files already cleaned by workers are reported when an earlier file fails."""
+    filenames = ["dotted-name.srt", "short-multiline.srt", "short-multiline-hyphen.srt"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        bad_file = Path(tmpdir) / "0bad.srt"
+        bad_file.write_bytes(b"1\n00:00:01,000 --> 00:00:02,000\n\xff\xfe\xff bad\n")
+        copies = [str(bad_file)]
+        for filename in filenames:
+            test_copy = Path(tmpdir) / filename
+            shutil.copy(get_test_file_path(filename), test_copy)
+            copies.append(str(test_copy))
+
+        stdout = StringIO()
+        with (
+            mock.patch.object(sys, "argv", ["nocc", *copies]),
+            mock.patch("os.cpu_count", return_value=2),
+            mock.patch("sys.stdout", new=stdout),
+        ):
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+
+        assert exit_info.value.code == 1
+        assert f"Error processing {bad_file}" in stdout.getvalue()
+        for filename in filenames:
+            test_copy = Path(tmpdir) / filename
+            if (Path(tmpdir) / f"_{filename}").exists():
+                assert f"Cleaned file: {test_copy}" in stdout.getvalue()
+            else:
+                assert test_copy.read_bytes() == get_test_file_path(filename).read_bytes()
+
+
+def test_main_multiple_files_mkv_fails():
+    """Test that files already cleaned by workers are reported when an MKV file aborts the run."""
+    filenames = ["dotted-name.srt", "short-multiline.srt", "short-multiline-hyphen.srt", "song.srt"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        mkv_file = Path(tmpdir) / "movie.mkv"
+        mkv_file.touch()
+        copies = [str(mkv_file)]
+        for filename in filenames:
+            test_copy = Path(tmpdir) / filename
+            shutil.copy(get_test_file_path(filename), test_copy)
+            copies.append(str(test_copy))
+
+        stdout = StringIO()
+        with (
+            mock.patch.object(sys, "argv", ["nocc", *copies]),
+            mock.patch("os.cpu_count", return_value=2),
+            mock.patch("nocc.mkvextract.check_mkvextract", return_value=True),
+            mock.patch("nocc.mkvextract.check_mkvmerge", return_value=False),
+            mock.patch("sys.stdout", new=stdout),
+        ):
+            with pytest.raises(SystemExit) as exit_info:
+                main()
+
+        assert exit_info.value.code == 1
+        for filename in filenames:
+            test_copy = Path(tmpdir) / filename
+            if (Path(tmpdir) / f"_{filename}").exists():
+                assert f"Cleaned file: {test_copy}" in stdout.getvalue()
+            else:
+                assert test_copy.read_bytes() == get_test_file_path(filename).read_bytes()
+
+
+def test_stream_subtitles():
+    """Test that subtitle blocks are split like pysrt, normalising unusual timings."""
+    lines = [
+        "1\r\n",
+        "00:00:01,000 --> 00:00:02,000\r\n",
+        "Hello\r\n",
+        "world\r\n",
+        "\r\n",
+        "02\n",
+        "0:0:3.500 --> 00:00:04,000 X1:10\n",
+        "Again\n",
+        "\n",
+        "3\n",
+        "broken\n",
+        "Skipped\n",
+    ]
+
+    assert list(_stream_subtitles(lines)) == [
+        ("1\n00:00:01,000 --> 00:00:02,000", "Hello\nworld"),
+        ("2\n00:00:03,500 --> 00:00:04,000 X1:10", "Again"),
+    ]
+
+
+def test_clean_text_cache_disabled():
+    """Test that a cache size of zero turns the cleaner's cache off."""
+
+    class NoCacheConfig(Config):
+        CACHE_SIZE = 0
+
+    cleaner = SubtitleCleaner(config=NoCacheConfig())
+
+    assert cleaner.clean_text("JOHN: Hello") == ("Hello", ["person"])
+    assert cleaner.clean_text("JOHN: Hello") == ("Hello", ["person"])
+    assert cleaner.cache_hits == 0
+    assert cleaner.cache_misses == 2
+
+
+def test_main_multiple_files():
+    """Test that main cleans several subtitle files in parallel."""
+    filenames = ["dotted-name.srt", "short-multiline.srt", "short-multiline-hyphen.srt", "song.srt"]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        copies = []
+        for filename in filenames:
+            test_copy = Path(tmpdir) / filename
+            shutil.copy(get_test_file_path(filename), test_copy)
+            copies.append(str(test_copy))
+
+        with (
+            mock.patch.object(sys, "argv", ["nocc", *copies]),
+            mock.patch("os.cpu_count", return_value=2),
+            mock.patch("sys.stdout", new=StringIO()),
+        ):
+            main()
+
+        for filename in filenames:
+            expected_content = read_srt_file(get_expected_output_path(filename))
+            actual_content = read_srt_file(Path(tmpdir) / filename)
+            assert actual_content == expected_content, f"Output mismatch for {filename}"